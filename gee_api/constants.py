@@ -1,12 +1,10 @@
-import json
+from functools import lru_cache
 import ee
-from django.http import JsonResponse
 
 email = "admin-133@ee-papnejaanmol.iam.gserviceaccount.com"
 key_file = "./creds/ee-papnejaanmol-23b4363dc984.json"
 credentials = ee.ServiceAccountCredentials(email=email, key_file=key_file)
 
-from django.http import HttpResponse
 ee.Initialize(credentials)
 
 ee_assets = {
@@ -18,6 +16,29 @@ ee_assets = {
 
 compare_village_buffer = 5000
 
+# IndiaSAT classes kept for display, remapped so both single and double cropping classes share a colour
+lulc_remap = {
+    'from' : [6, 8, 9, 10, 11, 12],
+    'to' : [6, 8, 8, 10, 10, 12],
+}
+
+# IndiaSAT classes summed into each cropping type for the area change chart
+cropping_classes = {
+    'single' : ('Single cropping cropland', (8, 9)),
+    'double' : ('Double cropping cropland', (10, 11)),
+}
+
+lulc_vis_params = {
+    'bands': ['remapped'],
+    'min': 0,
+    'max': 12,
+    'palette': [
+         '#b2df8a', '#6382ff', '#d7191c', '#f5ff8b', '#dcaa68',
+         '#397d49', '#50c361', '#8b9dc3', '#dac190', '#222f5b',
+         '#38c5f9', '#946b2d'
+    ]
+}
+
 shrug_fields = {
     'state_field' : 'state_name',
     'district_field': 'district_n',
@@ -26,6 +47,8 @@ shrug_fields = {
     'unique_field' : 'unique_name',
 }
 
+# The SHRUG asset listing is static, so list it once per process instead of on every request
+@lru_cache(maxsize=None)
 def shrug_dataset():
         assets = ee.data.listAssets(ee_assets['shrug_folder'])
         feature_collections = []
@@ -36,7 +59,7 @@ def shrug_dataset():
                feature_collection = ee.FeatureCollection(asset_id)
                feature_collections.append(feature_collection)
             else:
-               return JsonResponse({'error': 'Unable to access ee asset'}, status=500)
+               raise ValueError('Unable to access ee asset')
         
         # Merge all the FeatureCollections into a single variable
         return ee.FeatureCollection(feature_collections).flatten()
@@ -1,26 +1,16 @@
-# gee_api/views.py
+# gee_api/ee_processing.py
+import json
+import logging
 from datetime import datetime
-from venv import logger  
+from functools import lru_cache
 from django.http import JsonResponse
-from .utils import initialize_earth_engine
 import ee
-from django.conf import settings
-import json
-from django.shortcuts import render
-from pathlib import Path
-from django.views.decorators.http import require_http_methods
 
-# Constants Import
+# Constants Import (also initializes Earth Engine once per process)
 
 from .constants import ee_assets, shrug_dataset, shrug_fields, compare_village_buffer
 
-
-email = "admin-133@ee-papnejaanmol.iam.gserviceaccount.com"
-key_file = "./creds/ee-papnejaanmol-23b4363dc984.json"
-credentials = ee.ServiceAccountCredentials(email=email, key_file=key_file)
-
-from django.http import HttpResponse
-ee.Initialize(credentials)
+logger = logging.getLogger(__name__)
 
 
 def district_boundary(state_name, district_name):    
@@ -32,6 +22,14 @@ def district_boundary(state_name, district_name):
         raise ValueError(f"Error in fetching district boundary: {e}")
 
 
+# District boundaries are static; keep the last few as serialized JSON bytes, which are far
+# smaller than the parsed GeoJSON. Each worker holds its own copy and entries never expire,
+# so a SHRUG asset update only shows up after a redeploy (or worker restart).
+@lru_cache(maxsize=4)
+def district_geojson(state_name, district_name):
+    return json.dumps(district_boundary(state_name, district_name).getInfo()).encode()
+
+
 def village_boundary(state_name, district_name, subdistrict_name, village_name):
     try:
         shrug = shrug_dataset()
@@ -54,6 +52,14 @@ def compute_slope(feature):
         )
     return feature.set('slope_std_dev', std_dev.getNumber('slope'))
 
+def compute_slope_collection(feature_collection):
+    # Single reduceRegions pass over the collection instead of a reduceRegion per feature
+    return srtm_slope().reduceRegions(
+        collection=feature_collection,
+        reducer=ee.Reducer.stdDev().setOutputs(['slope_std_dev']),
+        scale=30
+        )
+
 def get_buffer(feature):
     return feature.geometry().buffer(compare_village_buffer)
 
@@ -64,7 +70,7 @@ def compare_village(state_name, district_name, subdistrict_name, village_name):
         intervention_slope = compute_slope(village)
         null_filter = ee.Filter.eq(shrug_fields['village_field'], '').Not()
         spatial_filter = ee.Filter.eq(shrug_fields['village_field'], village_name).Not()
-        buffer_fc = district_boundary(state_name, district_name).filterBounds(get_buffer(village)).filter(spatial_filter).filter(null_filter).map(compute_slope)
+        buffer_fc = compute_slope_collection(district_boundary(state_name, district_name).filterBounds(get_buffer(village)).filter(spatial_filter).filter(null_filter))
         value_to_subtract = ee.Number(intervention_slope.get('slope_std_dev'))
         def subtract_value(feature):
            property_value = ee.Number(feature.get('slope_std_dev'))
@@ -95,8 +101,6 @@ def IndiaSAT_lulc(year, state_name, district_name, subdistrict_name = None, vill
 
 
 def yearly_sum(year: int) -> ee.Image:
-    ee.Initialize(credentials)
-    # Your provided yearly_sum function here
     precipitation_collection =  ee.ImageCollection(ee_assets['imd_rain'])
     filter = precipitation_collection.filterDate(ee.Date.fromYMD(year, 6, 1),
                                                  ee.Date.fromYMD(ee.Number(year).add(1), 6, 1))
@@ -105,7 +109,6 @@ def yearly_sum(year: int) -> ee.Image:
 
 # Function to get statistics for an image
 def getStats(image: ee.Image, geometry: ee.Geometry) -> ee.Image:
-    # Your provided getStats function here
     stats = image.reduceRegion(
         reducer=ee.Reducer.mean(),
         geometry=geometry,
@@ -121,17 +124,19 @@ def IMD_precipitation(start_year, end_year, state_name, district_name, subdistri
         hyd_yr_col = ee.ImageCollection(ee.List(year_list).map(lambda year: yearly_sum(year)))
         collection_with_stats = hyd_yr_col.map(lambda image: getStats(image, village_geometry))
 
-        # Extract rainfall values and dates
-        rain_values = collection_with_stats.aggregate_array('b1').getInfo()  
-        dates = collection_with_stats.aggregate_array('system:time_start').getInfo()
-        dates = [datetime.fromtimestamp(date / 1000).strftime('%Y') for date in dates]
-        print(rain_values)
-        print(dates)
+        # Extract rainfall values and dates in a single request
+        stats = ee.Dictionary({
+            'rain_values': collection_with_stats.aggregate_array('b1'),
+            'dates': collection_with_stats.aggregate_array('system:time_start'),
+        }).getInfo()
+        rain_values = stats['rain_values']
+        dates = [datetime.fromtimestamp(date / 1000).strftime('%Y') for date in stats['dates']]
 
         # Combine dates and rain values for the response
         rainfall_data = list(zip(dates, rain_values))
         return JsonResponse({'rainfall_data': rainfall_data})
     except Exception as e:
+        logger.error('Failed to get IMD precipitation', exc_info=True)
         return JsonResponse({'error': str(e)}, status=500)
 
 